@@ -1,99 +1,322 @@
-import sys, asyncio, aiohttp, zipfile, json, re, shutil, platform, os, tempfile, io
+import sys, asyncio, aiohttp, zipfile, json, re, shutil, platform, os, tempfile, io, multiprocessing, struct, bisect
 from pathlib import Path
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from difflib import SequenceMatcher
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QSpinBox, QCheckBox, QProgressBar, QTableWidget, QTableWidgetItem,
-    QFileDialog, QTextEdit, QHeaderView, QAbstractItemView, QComboBox, QFrame, QSizePolicy, QScrollArea, QSplitter, QGroupBox)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QBuffer
-from PyQt6.QtGui import QDesktopServices, QColor, QPixmap, QIcon, QImage
+    QFileDialog, QTextEdit, QHeaderView, QAbstractItemView, QComboBox, QFrame, QSizePolicy, QScrollArea, QSplitter, QGroupBox,
+    QStyledItemDelegate, QStyleOptionButton, QStyle, QToolTip)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QBuffer, QEvent, QRect, QSize
+from PyQt6.QtGui import QDesktopServices, QColor, QPixmap, QIcon, QImage, QPalette
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # 未安装 rapidfuzz 时退回 difflib
+    fuzz = None
+try:
+    from orjson import loads as json_loads
+except ImportError:  # 未安装 orjson 时使用标准库
+    json_loads = json.loads
+try:
+    from uvloop import new_event_loop
+except ImportError:  # Windows 上对应的是 winloop，都没有时使用 asyncio 默认事件循环
+    try:
+        from winloop import new_event_loop
+    except ImportError:
+        new_event_loop = asyncio.new_event_loop
+try:
+    import tomllib
+except ImportError:  # Python 3.11 以下尝试 tomli，都没有时退回逐行查找
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 # ----------------------
 # 工具函数
 # ----------------------
-def clean_json(text: str) -> str:
-    return re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", text)
+_CTRL_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
 
 def safe_decode(data):
     if isinstance(data, bytes):
         return data.decode("utf-8", errors="ignore")
     return data
 
-def similarity(a, b):
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
-
+def similarity(a, b, cutoff=0.0):
+    """名称相似度（0~1）；低于 cutoff 时直接返回 0，省去完整计算"""
+    # rapidfuzz 与 difflib 的分数并不总相同；但名称最多贡献 50 分，低于 MODRINTH_MIN_SCORE，
+    # 只有 slug 与 mod id 相同的候选能达到门槛，所以选中的链接不受影响
+    if fuzz:
+        return fuzz.ratio(a.lower(), b.lower(), score_cutoff=cutoff * 100) / 100.0
+    s = SequenceMatcher(None, a.lower(), b.lower())
+    if s.real_quick_ratio() < cutoff or s.quick_ratio() < cutoff:
+        return 0.0
+    ratio = s.ratio()
+    return ratio if ratio >= cutoff else 0.0
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+@lru_cache(maxsize=4096)
 def curseforge_link(name):
-    return f"https://www.curseforge.com/minecraft/mc-mods/{name}"
-
+    # CurseForge 项目地址使用小写、连字符分隔的 slug，撇号直接去掉（Xaero's Minimap -> xaeros-minimap）
+    slug = _SLUG_RE.sub("-", name.lower().replace("'", "")).strip("-")
+    if not slug:
+        # 名称中没有可用字符（如纯中文）时改用站内搜索
+        return f"https://www.curseforge.com/minecraft/search?search={quote(name.strip())}"
+    return f"https://www.curseforge.com/minecraft/mc-mods/{slug}"
+
+@lru_cache(maxsize=4096)
 def mcmod_link(name):
-    return f"https://search.mcmod.cn/s?key={name}"
+    return f"https://search.mcmod.cn/s?key={quote(name.strip())}"
 
-def extract_icon_from_jar(jar_path, icon_path):
-    """从jar文件中提取图标"""
+def load_icon_image(icon_data):
+    """在工作线程中解码并缩放图标（QImage 可在非 GUI 线程使用），界面只需转成 QPixmap"""
     try:
-        with zipfile.ZipFile(jar_path) as z:
-            if icon_path in z.namelist():
-                return z.read(icon_path)
-    except:
-        pass
+        image = QImage.fromData(icon_data)
+        if not image.isNull():
+            return image.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    except Exception as e:
+        print(f"图标加载失败: {e}")
     return None
 
+def place_file(src, dst, use_hardlink=True):
+    """把 mod 放入分类目录：优先创建硬链接（同一分区内无需复制内容），失败时退回复制"""
+    if use_hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
 # ----------------------
 # 解析 Mod
 # ----------------------
 def parse_fabric(text, jar_name=None):
     try:
-        data = json.loads(clean_json(text))
-    except:
-        return None
+        data = json_loads(text)
+    except ValueError:
+        # 极少数 jar 的 json 中混有控制字符，解析失败时才清理后重试
+        try:
+            data = json_loads(_CTRL_RE.sub("", text))
+        except ValueError:
+            return None
     env = data.get("environment", "*")
-    mod_id = data.get("id")
-    mod_name = data.get("name") or jar_name
+    # 只接受字符串形式的 id/name，其它类型（数字、列表等）视为没有填写
+    mod_id = data.get("id") if isinstance(data.get("id"), str) else None
+    mod_name = data.get("name") if isinstance(data.get("name"), str) else None
+    mod_name = mod_name or jar_name
     icon = data.get("icon")
     return {"loader": "fabric", "id": mod_id, "name": mod_name, "env": env, "icon": icon}
 
+def toml_flag(value):
+    return value is True or (isinstance(value, str) and value.lower() == "true")
+
+def toml_text(value):
+    """mods.toml 中 ${file.jarVersion} 之类的占位符由加载器运行时替换，视为没有填写"""
+    if isinstance(value, str) and value and "${" not in value:
+        return value
+    return None
+
 def parse_forge(text, jar_name=None):
-    client_only = False
-    for line in text.splitlines():
-        if "clientOnly" in line and "true" in line.lower():
-            client_only = True
-    return {"loader": "forge", "client_only": client_only, "id": None, "name": jar_name, "icon": None}
+    data = None
+    if tomllib:
+        try:
+            data = tomllib.loads(text)
+        except tomllib.TOMLDecodeError:
+            pass
+    if data is None:
+        # 无法按 TOML 解析时逐行查找，跳过注释
+        client_only = False
+        for line in text.splitlines():
+            line = line.split("#", 1)[0]
+            if "clientOnly" in line and "true" in line.lower():
+                client_only = True
+        return {"loader": "forge", "client_only": client_only, "id": None, "name": jar_name, "icon": None}
+    mods = data.get("mods")
+    first = mods[0] if isinstance(mods, list) and mods and isinstance(mods[0], dict) else {}
+    client_only = toml_flag(data.get("clientOnly")) or toml_flag(first.get("clientOnly"))
+    mod_id = toml_text(first.get("modId"))
+    mod_name = toml_text(first.get("displayName")) or jar_name
+    return {"loader": "forge", "client_only": client_only, "id": mod_id, "name": mod_name, "icon": None}
+
+FABRIC_META_PATH = "fabric.mod.json"
+FORGE_META_PATHS = ("META-INF/mods.toml", "META-INF/neoforge.mods.toml")
+
+def find_metadata_entry(z):
+    """定位元数据条目，返回 (类型, ZipInfo)；先按已知路径直接查表，找不到再遍历"""
+    names = z.NameToInfo
+    info = names.get(FABRIC_META_PATH)
+    if info:
+        return "fabric", info
+    for path in FORGE_META_PATHS:
+        info = names.get(path)
+        if info:
+            return "forge", info
+    # 非常规布局（如嵌套目录）才遍历整个中央目录
+    for info in z.infolist():
+        name = info.filename
+        if name.endswith("fabric.mod.json"):
+            return "fabric", info
+        if name.endswith("mods.toml"):
+            return "forge", info
+    return None, None
+
+ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")  # 本地文件头：签名 + 文件名/扩展字段长度，共 30 字节
+
+def read_entry(z, info):
+    """读取元数据条目：未压缩且未加密的条目直接按偏移读取原始字节，跳过解压流程和 CRC 校验"""
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return z.read(info)
+    fp = z.fp
+    fp.seek(info.header_offset)
+    header = fp.read(ZIP_LOCAL_HEADER.size)
+    if len(header) != ZIP_LOCAL_HEADER.size:
+        return z.read(info)
+    magic, name_len, extra_len = ZIP_LOCAL_HEADER.unpack(header)
+    if magic != b"PK\x03\x04":
+        return z.read(info)
+    fp.seek(name_len + extra_len, io.SEEK_CUR)
+    return fp.read(info.file_size)
+
+def read_icon(z, icon):
+    """从已打开的jar中读取图标；fabric 的 icon 也可能是 {尺寸: 路径} 字典，取最大尺寸"""
+    if isinstance(icon, dict):
+        sizes = [k for k in icon if str(k).isdigit()]
+        icon = icon[max(sizes, key=int)] if sizes else None
+    if not isinstance(icon, str):
+        return None
+    info = z.NameToInfo.get(icon.lstrip("/"))
+    if not info:
+        return None
+    try:
+        return z.read(info)
+    except Exception:
+        return None
 
 def read_metadata(jar: Path):
+    """在进程池中执行：只打开一次jar，解析元数据并提取图标，返回 (meta, error, icon_data)"""
     try:
         with zipfile.ZipFile(jar) as z:
-            for info in z.infolist():
-                name = info.filename
-                if name.endswith("fabric.mod.json"):
-                    meta = parse_fabric(safe_decode(z.read(info)), jar.stem)
-                    return meta, None if meta else "fabric.mod.json解析失败"
-                if name.endswith("mods.toml"):
-                    meta = parse_forge(safe_decode(z.read(info)), jar.stem)
-                    return meta, None if meta else "mods.toml解析失败"
-        return {"loader": None, "id": None, "name": jar.stem}, "未找到mods.toml或fabric.mod.json"
+            kind, info = find_metadata_entry(z)
+            if kind == "fabric":
+                meta = parse_fabric(safe_decode(read_entry(z, info)), jar.stem)
+                icon_data = read_icon(z, meta.get("icon")) if meta else None
+                return meta, None if meta else "fabric.mod.json解析失败", icon_data
+            if kind == "forge":
+                meta = parse_forge(safe_decode(read_entry(z, info)), jar.stem)
+                icon_data = read_icon(z, meta.get("icon")) if meta else None
+                return meta, None if meta else "mods.toml解析失败", icon_data
+        return {"loader": None, "id": None, "name": jar.stem}, "未找到mods.toml或fabric.mod.json", None
     except Exception as e:
-        return {"loader": None, "id": None, "name": jar.stem}, str(e)
+        return {"loader": None, "id": None, "name": jar.stem}, str(e), None
+
+# (加载器, 是否仅客户端) -> 分类；fabric 看 environment，forge 看 clientOnly
+_CLASSIFY = {
+    ("fabric", True): "仅客户端",
+    ("fabric", False): "服务端",
+    ("forge", True): "仅客户端",
+    ("forge", False): "服务端",
+}
 
 def classify(meta):
     if not meta:
         return "解析失败"
-    if meta.get("loader") == "fabric":
-        if meta.get("env") == "client":
-            return "仅客户端"
-        return "服务端"
-    if meta.get("loader") == "forge":
-        if meta.get("client_only"):
-            return "仅客户端"
-        return "服务端"
-    if meta.get("loader") is None:
-        return "解析失败"
-    return "服务端"
+    loader = meta.get("loader")
+    client_only = meta.get("env") == "client" if loader == "fabric" else bool(meta.get("client_only"))
+    # 表中没有的加载器：未识别(None)视为解析失败，其余按服务端处理
+    return _CLASSIFY.get((loader, client_only), "解析失败" if loader is None else "服务端")
+
+# ----------------------
+# 事件循环、HTTP 会话与进程池
+# ----------------------
+_loop = None
+_session = None
+_pool = None
+_retry_pool = None
+
+def get_loop():
+    """各次分析共用同一个事件循环，HTTP 会话（连接池、TLS、DNS缓存）才能跨分析复用"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = new_event_loop()
+    return _loop
+
+async def get_session():
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, enable_cleanup_closed=True)
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+def close_session():
+    """程序退出时关闭会话；分析线程仍在运行时跳过"""
+    global _session
+    if _session and not _session.closed and _loop and not _loop.is_running():
+        _loop.run_until_complete(_session.close())
+    _session = None
+
+def new_pool(max_workers=None):
+    # 统一用 spawn 启动子进程：与 Windows/打包版行为一致，也避免在多线程进程（Qt、分析线程）中 fork
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def get_pool():
+    """jar 解析用的进程池同样跨分析复用，避免每次分析都重新启动子进程"""
+    global _pool
+    if _pool is None:
+        _pool = new_pool()
+    return _pool
+
+def get_retry_pool():
+    """单进程的重试池，用于逐个重试因进程池崩溃而受牵连的 jar"""
+    global _retry_pool
+    if _retry_pool is None:
+        _retry_pool = new_pool(max_workers=1)
+    return _retry_pool
+
+def discard_pool(pool):
+    """子进程崩溃后进程池无法再用，丢弃后下次取用时重新创建"""
+    global _pool, _retry_pool
+    if _pool is pool:
+        _pool = None
+    if _retry_pool is pool:
+        _retry_pool = None
+    pool.shutdown(wait=False)
+
+def shutdown_pool():
+    """程序退出时关闭进程池"""
+    global _pool, _retry_pool
+    for pool in (_pool, _retry_pool):
+        if pool:
+            pool.shutdown(wait=False)
+    _pool = _retry_pool = None
+
+MODRINTH_MIN_SCORE = 60
+# (mod id, 名称) -> Modrinth 链接；只缓存 API 给出明确结果的查询，网络错误下次仍会重试
+_modrinth_cache = {}
 
 async def modrinth_link(meta, session):
     query = meta.get("id") or meta.get("name")
     if not query:
         return None
     try:
+        key = (meta.get("id"), meta.get("name"))
+        if key in _modrinth_cache:
+            return _modrinth_cache[key]
+        # 有 mod id 时先按 slug 直接查项目，命中即可省去搜索和相似度计算
+        if meta.get("id"):
+            url = f"https://api.modrinth.com/v2/project/{quote(meta['id'], safe='')}"
+            async with session.get(url, timeout=5) as r:
+                if r.status == 200:
+                    data = await r.json()
+                    if data.get("project_type") == "mod" and data.get("slug"):
+                        link = f"https://modrinth.com/mod/{data['slug']}"
+                        _modrinth_cache[key] = link
+                        return link
         url = "https://api.modrinth.com/v2/search"
         params = {"query": query, "facets": '[["project_type:mod"]]'}
         async with session.get(url, params=params, timeout=5) as r:
@@ -107,12 +330,17 @@ async def modrinth_link(meta, session):
                 score = 0
                 if meta.get("id") and h.get("slug") == meta["id"]:
                     score += 100
-                score += similarity(meta.get("name", ""), h.get("title", "")) * 50
+                # 名称最多贡献 50 分，达不到门槛或无法超过当前最佳的候选直接跳过
+                need = max(best_score, MODRINTH_MIN_SCORE) - score
+                if need > 50:
+                    continue
+                score += similarity(meta.get("name", ""), h.get("title", ""), max(need, 0) / 50) * 50
                 if score > best_score:
                     best = h
                     best_score = score
-            if best_score >= 60:
-                return f"https://modrinth.com/mod/{best['slug']}"
+            link = f"https://modrinth.com/mod/{best['slug']}" if best_score >= MODRINTH_MIN_SCORE else None
+            _modrinth_cache[key] = link
+            return link
     except:
         return None
     return None
@@ -120,27 +348,44 @@ async def modrinth_link(meta, session):
 # ----------------------
 # Worker线程
 # ----------------------
+# 解析结果攒够一批或每隔一段时间才发给界面，避免逐个插入表格堵塞 GUI 线程
+MOD_BATCH_SIZE = 32
+MOD_BATCH_INTERVAL = 0.05
+
 class ModAnalyzerThread(QThread):
     update_progress = pyqtSignal(int,int)
     log_signal = pyqtSignal(str,str)
-    mod_signal = pyqtSignal(dict)
+    mod_batch_signal = pyqtSignal(list)
     finished_dir = pyqtSignal(Path)
 
-    def __init__(self, mods_dir, gen_folder=True, gen_log=True, max_threads=5):
+    def __init__(self, mods_dir, gen_folder=True, gen_log=True, max_threads=5, use_hardlink=True):
         super().__init__()
         self.mods_dir = mods_dir
         self.gen_folder = gen_folder
         self.gen_log = gen_log
+        self.use_hardlink = use_hardlink
         self.max_threads = max_threads
         self.output_dir = None
-        self.all_mods = []
+        # 各分类的 mod 按名称（小写）有序存放，_section_keys 为对应的排序键
+        self.sections = {"服务端":[], "仅客户端":[], "解析失败":[]}
+        self._section_keys = {"服务端":[], "仅客户端":[], "解析失败":[]}
+        self._pending = []
+        self.total_jars = 0
+        self.done_count = 0
+        self.retry_lock = None
+        self.parse_sem = None
+        self.net_sem = None
 
     def run(self):
-        asyncio.run(self.analyze_mods())
+        get_loop().run_until_complete(self.analyze_mods())
 
     async def analyze_mods(self):
-        jars = list(self.mods_dir.glob("*.jar"))
+        # scandir 一次就能拿到文件名和类型；后缀不区分大小写，与 Windows 下 glob 的行为一致
+        with os.scandir(self.mods_dir) as entries:
+            jars = [Path(e.path) for e in entries if e.name.lower().endswith(".jar") and e.is_file()]
         total = len(jars)
+        self.total_jars = total
+        self.done_count = 0
         if total == 0:
             self.log_signal.emit("❌ 未找到 Jar 文件","red")
             return
@@ -156,21 +401,27 @@ class ModAnalyzerThread(QThread):
             server_dir.mkdir(parents=True, exist_ok=True)
             fail_dir.mkdir(parents=True, exist_ok=True)
 
-        sem = asyncio.Semaphore(self.max_threads)
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for jar in jars:
-                tasks.append(self.process_jar_with_sem(jar, session, sem, client_dir, server_dir, fail_dir))
+        # 解析（CPU/磁盘）与 Modrinth 请求（网络）分别限流：前者按核心数，后者按用户设置的并发数
+        self.parse_sem = asyncio.Semaphore(os.cpu_count() or 1)
+        self.net_sem = asyncio.Semaphore(self.max_threads)
+        # jar 解析放到进程池中，事件循环只负责 Modrinth 请求
+        self.retry_lock = asyncio.Lock()
+        session = await get_session()
+        tasks = []
+        for jar in jars:
+            tasks.append(self.process_jar_with_sem(jar, session, client_dir, server_dir, fail_dir))
+        flusher = asyncio.ensure_future(self.flush_mods_periodically())
+        try:
             await asyncio.gather(*tasks)
+        finally:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            self.flush_mods()
 
         # 生成日志文件
         if self.gen_log:
-            sections = {"服务端":[], "仅客户端":[], "解析失败":[]}
-            for m in self.all_mods:
-                sections[m["category"]].append(m)
-
             log_file = out_dir / f"{date_str}_分析.txt"
-            with open(log_file,"w",encoding="utf-8") as f:
+            with open(log_file,"w",encoding="utf-8",buffering=1<<20) as f:
                 # 在日志文件开头添加提示信息和作者信息
                 f.write("===== 重要提示 =====\n")
                 f.write("1. 端属分类是从模组文件中解析，可靠性较高，但不一定完全准确\n")
@@ -185,56 +436,98 @@ class ModAnalyzerThread(QThread):
                 f.write("使用AI进行开发\n")
                 f.write(f"版本: 0.3.0-2026.1.3\n\n")
                 
+                # 每个 mod 拼成一整行，最后一次性写入
+                lines = []
                 for sec in ["服务端","仅客户端","解析失败"]:
-                    f.write(f"\n===== {sec} =====\n\n")
-                    for m in sorted(sections[sec], key=lambda x:x["name"].lower()):
-                        f.write(f"[{sec}] {m['name']}")
-                        if m.get("error"):
-                            f.write(f" ({m['error']})")
-                        f.write(f" | CF: {m['links']['curseforge']}")
-                        f.write(f" | MR: {m['links']['modrinth']}")
-                        f.write(f" | MC: {m['links']['mcmod']}\n")
+                    lines.append(f"\n===== {sec} =====\n\n")
+                    for m in self.sections[sec]:
+                        error = f" ({m['error']})" if m.get("error") else ""
+                        links = m["links"]
+                        lines.append(f"[{sec}] {m['name']}{error} | CF: {links['curseforge']}"
+                                     f" | MR: {links['modrinth']} | MC: {links['mcmod']}\n")
+                f.writelines(lines)
 
         self.finished_dir.emit(out_dir)
 
-    async def process_jar_with_sem(self, jar, session, sem, client_dir, server_dir, fail_dir):
-        async with sem:
+    async def process_jar_with_sem(self, jar, session, client_dir, server_dir, fail_dir):
+        try:
+            async with self.parse_sem:
+                try:
+                    meta, error, icon_data = await self.parse_jar(jar)
+                except Exception as e:
+                    # 重试后子进程仍崩溃，或结果无法传回时，按解析失败处理
+                    error = "解析进程崩溃" if isinstance(e, BrokenProcessPool) else str(e) or type(e).__name__
+                    meta, icon_data = {"loader": None, "id": None, "name": jar.stem}, None
+            category = classify(meta)
+            name_for_link = meta.get("name") if meta else jar.stem
+            cf_link = curseforge_link(name_for_link)
+            mc_link = mcmod_link(name_for_link)
+            mr_link = None
+            if meta:
+                async with self.net_sem:
+                    mr_link = await modrinth_link(meta, session)
+            links = {"curseforge": cf_link, "modrinth": mr_link, "mcmod": mc_link}
+
+            color = "green" if category=="服务端" else "orange" if category=="仅客户端" else "red"
+            status_text = f"{category}" if not error else f"{category} ({error})"
+            self.log_signal.emit(f"{jar.name} → {status_text}", color)
+
+            mod_info = {"name": jar.name, "category": category, "links": links, "error": error, "icon": None,
+                        "icon_image": load_icon_image(icon_data) if icon_data else None}
+            
+            self.add_to_section(mod_info)
+            self._pending.append(mod_info)
+            if len(self._pending) >= MOD_BATCH_SIZE:
+                self.flush_mods()
+
+            if self.gen_folder:
+                try:
+                    if category=="仅客户端":
+                        place_file(jar, client_dir / jar.name, self.use_hardlink)
+                    elif category=="服务端":
+                        place_file(jar, server_dir / jar.name, self.use_hardlink)
+                    else:
+                        place_file(jar, fail_dir / jar.name, self.use_hardlink)
+                except Exception as e:
+                    self.log_signal.emit(f"⚠ 复制失败: {jar.name} → {e}", "red")
+        finally:
+            self.done_count += 1
+            self.update_progress.emit(self.done_count, self.total_jars)
+
+    async def parse_jar(self, jar):
+        """在进程池中执行 read_metadata。一个子进程崩溃会让池中所有任务一起失败，无法判断是哪个 jar 导致的，
+        因此受牵连的 jar 逐个放到单进程池中重试，只有重试时再次崩溃的才算该 jar 自身的问题"""
+        loop = asyncio.get_running_loop()
+        pool = get_pool()
+        try:
+            return await loop.run_in_executor(pool, read_metadata, jar)
+        except BrokenProcessPool:
+            discard_pool(pool)
+        async with self.retry_lock:
+            pool = get_retry_pool()
             try:
-                meta, error = read_metadata(jar)
-                category = classify(meta)
-                name_for_link = meta.get("name") if meta else jar.stem
-                cf_link = curseforge_link(name_for_link)
-                mc_link = mcmod_link(name_for_link)
-                mr_link = await modrinth_link(meta, session) if meta else None
-                links = {"curseforge": cf_link, "modrinth": mr_link, "mcmod": mc_link}
-
-                color = "green" if category=="服务端" else "orange" if category=="仅客户端" else "red"
-                status_text = f"{category}" if not error else f"{category} ({error})"
-                self.log_signal.emit(f"{jar.name} → {status_text}", color)
-
-                mod_info = {"name": jar.name, "category": category, "links": links, "error": error, "icon": None, "icon_data": None}
-                
-                # 提取图标数据
-                if meta and meta.get("icon"):
-                    icon_data = extract_icon_from_jar(jar, meta["icon"])
-                    if icon_data:
-                        mod_info["icon_data"] = icon_data
-                
-                self.all_mods.append(mod_info)
-                self.mod_signal.emit(mod_info)
-
-                if self.gen_folder:
-                    try:
-                        if category=="仅客户端":
-                            shutil.copy2(jar, client_dir / jar.name)
-                        elif category=="服务端":
-                            shutil.copy2(jar, server_dir / jar.name)
-                        else:
-                            shutil.copy2(jar, fail_dir / jar.name)
-                    except Exception as e:
-                        self.log_signal.emit(f"⚠ 复制失败: {jar.name} → {e}", "red")
-            finally:
-                self.update_progress.emit(len(self.all_mods), len(list(self.mods_dir.glob("*.jar"))))
+                return await loop.run_in_executor(pool, read_metadata, jar)
+            except BrokenProcessPool:
+                discard_pool(pool)
+                raise
+
+    def add_to_section(self, mod_info):
+        """插入到所属分类的有序位置，写日志时无需再排序；同名按完成顺序排列"""
+        sort_key = mod_info["name"].lower()
+        keys = self._section_keys[mod_info["category"]]
+        i = bisect.bisect_right(keys, sort_key)
+        keys.insert(i, sort_key)
+        self.sections[mod_info["category"]].insert(i, mod_info)
+
+    def flush_mods(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.mod_batch_signal.emit(batch)
+
+    async def flush_mods_periodically(self):
+        while True:
+            await asyncio.sleep(MOD_BATCH_INTERVAL)
+            self.flush_mods()
 
 class ClickableLabel(QLabel):
     """可点击的标签，用于显示超链接"""
@@ -245,6 +538,79 @@ class ClickableLabel(QLabel):
         self.setOpenExternalLinks(True)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
 
+class LinksDelegate(QStyledItemDelegate):
+    """链接列委托：直接在单元格内绘制 CF/MR/MC百科 按钮并处理点击，不必为每一行创建按钮控件"""
+    LINKS = [("curseforge", "CF"), ("modrinth", "MR"), ("mcmod", "MC百科")]
+    BUTTON_WIDTH = 60
+    BUTTON_HEIGHT = 26
+    SPACING = 4
+
+    def button_rects(self, rect):
+        top = rect.top() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        return [QRect(rect.left() + 2 + i * (self.BUTTON_WIDTH + self.SPACING), top, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+                for i in range(len(self.LINKS))]
+
+    def link_at(self, index, rect, pos):
+        """返回 pos 处按钮的 (是否命中, 链接)"""
+        links = index.data(Qt.ItemDataRole.UserRole) or {}
+        for (key, _), button_rect in zip(self.LINKS, self.button_rects(rect)):
+            if button_rect.contains(pos):
+                return True, links.get(key)
+        return False, None
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        links = index.data(Qt.ItemDataRole.UserRole) or {}
+        style = option.widget.style() if option.widget else QApplication.style()
+        rects = self.button_rects(option.rect)
+        for (key, display), rect in zip(self.LINKS, rects):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = display
+            button.state = QStyle.StateFlag.State_Raised
+            button.palette = QPalette(option.palette)
+            if links.get(key):
+                button.state |= QStyle.StateFlag.State_Enabled
+            else:
+                button.palette.setCurrentColorGroup(QPalette.ColorGroup.Disabled)
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+        # 如果所有链接都不可用，显示提示
+        if not any(links.values()):
+            painter.save()
+            font = painter.font()
+            font.setItalic(True)
+            painter.setFont(font)
+            painter.setPen(QColor("gray"))
+            text_rect = QRect(rects[-1].right() + self.SPACING, option.rect.top(), option.rect.right() - rects[-1].right(), option.rect.height())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "无链接")
+            painter.restore()
+
+    def sizeHint(self, option, index):
+        count = len(self.LINKS)
+        width = 4 + count * self.BUTTON_WIDTH + (count - 1) * self.SPACING
+        links = index.data(Qt.ItemDataRole.UserRole) or {}
+        if not any(links.values()):
+            width += self.SPACING + option.fontMetrics.horizontalAdvance("无链接")
+        return QSize(width, self.BUTTON_HEIGHT + 4)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            hit, url = self.link_at(index, option.rect, event.position().toPoint())
+            if url:
+                QDesktopServices.openUrl(QUrl(url))
+            if hit:
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            hit, url = self.link_at(index, option.rect, event.pos())
+            if hit:
+                QToolTip.showText(event.globalPos(), url or "链接不可用", view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
 # ----------------------
 # GUI
 # ----------------------
@@ -315,6 +681,7 @@ class ModAnalyzerGUI(QWidget):
         self.thread_spin = QSpinBox()
         self.thread_spin.setRange(1,20)
         self.thread_spin.setValue(5)
+        self.thread_spin.setToolTip("同时进行的 Modrinth 查询数；jar 解析按 CPU 核心数并行")
         thread_layout.addWidget(self.thread_spin)
         control_layout.addLayout(thread_layout)
 
@@ -324,8 +691,13 @@ class ModAnalyzerGUI(QWidget):
         self.gen_log_cb.setChecked(True)
         self.gen_folder_cb = QCheckBox("生成分类文件夹")
         self.gen_folder_cb.setChecked(True)
+        self.hardlink_cb = QCheckBox("使用硬链接")
+        self.hardlink_cb.setChecked(True)
+        self.hardlink_cb.setToolTip("分类文件夹中的模组以硬链接代替复制，速度更快且不占用额外空间；\n硬链接与原文件共享内容，修改其中一个会影响另一个。跨分区时自动改为复制")
+        self.gen_folder_cb.toggled.connect(self.hardlink_cb.setEnabled)
         options_layout.addWidget(self.gen_log_cb)
         options_layout.addWidget(self.gen_folder_cb)
+        options_layout.addWidget(self.hardlink_cb)
         options_layout.addStretch()
         control_layout.addLayout(options_layout)
 
@@ -395,6 +767,7 @@ class ModAnalyzerGUI(QWidget):
             table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
             table.verticalHeader().setDefaultSectionSize(40)  # 减小行高
             table.setAlternatingRowColors(True)  # 交替行颜色
+            table.setItemDelegateForColumn(3, LinksDelegate(table))  # 链接列按钮由委托绘制
             
             group_layout.addWidget(table)
             group_box.setLayout(group_layout)
@@ -449,18 +822,22 @@ class ModAnalyzerGUI(QWidget):
         self.progress.setValue(0)
         self.output_dir = None
         self.open_dir_btn.setEnabled(False)
+        # 所有分析共用一个事件循环，同一时间只能运行一个分析
+        self.start_btn.setEnabled(False)
         self.log_text.clear()
 
         self.worker = ModAnalyzerThread(
             self.mods_dir,
             self.gen_folder_cb.isChecked(),
             self.gen_log_cb.isChecked(),
-            self.thread_spin.value()
+            self.thread_spin.value(),
+            self.hardlink_cb.isChecked()
         )
         self.worker.update_progress.connect(self.on_progress)
         self.worker.log_signal.connect(self.on_log)
-        self.worker.mod_signal.connect(self.on_mod)
+        self.worker.mod_batch_signal.connect(self.on_mod_batch)
         self.worker.finished_dir.connect(self.set_output_dir)
+        self.worker.finished.connect(lambda: self.start_btn.setEnabled(True))
         self.worker.start()
 
     def on_progress(self, current, total):
@@ -479,7 +856,20 @@ class ModAnalyzerGUI(QWidget):
         self.log_text.append(msg)
         self.log_text.moveCursor(self.log_text.textCursor().MoveOperation.End)
 
-    def on_mod(self, mod_info):
+    def on_mod_batch(self, mods):
+        # 批量插入期间暂停重绘和排序，插入完成后统一刷新
+        for table in self.tables.values():
+            table.setUpdatesEnabled(False)
+            table.setSortingEnabled(False)
+        try:
+            for mod_info in mods:
+                self.add_mod_row(mod_info)
+        finally:
+            for table in self.tables.values():
+                table.setSortingEnabled(True)
+                table.setUpdatesEnabled(True)
+
+    def add_mod_row(self, mod_info):
         table = self.tables.get(mod_info["category"], self.tables["解析失败"])
         row = table.rowCount()
         table.insertRow(row)
@@ -489,18 +879,9 @@ class ModAnalyzerGUI(QWidget):
 
         # 图标列
         icon_item = QTableWidgetItem()
-        if mod_info.get("icon_data"):
-            try:
-                # 将字节数据转换为QPixmap
-                pixmap = QPixmap()
-                pixmap.loadFromData(mod_info["icon_data"])
-                
-                # 缩放图标到合适大小（减小图标尺寸）
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    icon_item.setData(Qt.ItemDataRole.DecorationRole, scaled_pixmap)
-            except Exception as e:
-                print(f"图标加载失败: {e}")
+        if mod_info.get("icon_image") is not None:
+            # 图标已在工作线程中解码和缩放
+            icon_item.setData(Qt.ItemDataRole.DecorationRole, QPixmap.fromImage(mod_info["icon_image"]))
         
         table.setItem(row, 0, icon_item)
 
@@ -528,35 +909,11 @@ class ModAnalyzerGUI(QWidget):
         
         table.setItem(row, 2, category_item)
 
-        # 链接列（按钮）
-        links_widget = QWidget()
-        hbox = QHBoxLayout()
-        hbox.setContentsMargins(2, 0, 2, 0)
-        
-        # 创建链接按钮
-        link_buttons = []
-        for key, display in zip(["curseforge","modrinth","mcmod"], ["CF","MR","MC百科"]):
-            btn = QPushButton(display)
-            url = mod_info["links"].get(key)
-            if url:
-                btn.clicked.connect(lambda checked, url=url: QDesktopServices.openUrl(QUrl(url)))
-                btn.setToolTip(url)
-            else:
-                btn.setEnabled(False)
-                btn.setToolTip("链接不可用")
-            btn.setMaximumWidth(70)
-            btn.setMaximumHeight(28)
-            hbox.addWidget(btn)
-            link_buttons.append(btn)
-        
-        # 如果所有链接都不可用，显示提示
-        if not any(mod_info["links"].values()):
-            no_links_label = QLabel("无链接")
-            no_links_label.setStyleSheet("color: gray; font-style: italic;")
-            hbox.addWidget(no_links_label)
-        
-        links_widget.setLayout(hbox)
-        table.setCellWidget(row, 3, links_widget)
+        # 链接列（由 LinksDelegate 绘制按钮）
+        links_item = QTableWidgetItem()
+        links_item.setData(Qt.ItemDataRole.UserRole, mod_info["links"])
+        links_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+        table.setItem(row, 3, links_item)
 
     def set_output_dir(self, path:Path):
         self.output_dir = path
@@ -571,7 +928,10 @@ class ModAnalyzerGUI(QWidget):
 # 启动
 # ----------------------
 if __name__=="__main__":
+    multiprocessing.freeze_support()  # 打包为 exe 后进程池需要
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_session)
+    app.aboutToQuit.connect(shutdown_pool)
     gui = ModAnalyzerGUI()
     gui.show()
     sys.exit(app.exec())
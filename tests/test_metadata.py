@@ -0,0 +1,202 @@
+import importlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+pytest.importorskip("aiohttp")
+
+# 脚本文件名含连字符无法直接 import；复制为可导入的模块，进程池（spawn）的子进程也能按名称导入它
+SCRIPT = Path(__file__).resolve().parent.parent / "minecraft-modSide-analyzer.py"
+MODULE_DIR = Path(tempfile.mkdtemp())
+shutil.copy(SCRIPT, MODULE_DIR / "modside_analyzer.py")
+(MODULE_DIR / "crash_helper.py").write_text(
+    "import os\n"
+    "import modside_analyzer\n"
+    "\n"
+    "def read_metadata(jar):\n"
+    "    if jar.name == 'crash.jar':\n"
+    "        os._exit(1)\n"
+    "    return modside_analyzer.read_metadata(jar)\n",
+    encoding="utf-8",
+)
+sys.path.insert(0, str(MODULE_DIR))
+analyzer = importlib.import_module("modside_analyzer")
+
+
+def make_jar(path, fabric_meta):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("fabric.mod.json", json.dumps(fabric_meta))
+    return path
+
+
+@pytest.mark.parametrize("fabric_meta", [
+    {"id": "bad", "name": 123},
+    {"id": "bad", "name": ["a", "b"]},
+    {"id": ["a"], "name": {"x": 1}},
+])
+def test_non_string_fabric_id_and_name(tmp_path, fabric_meta):
+    jar = make_jar(tmp_path / "bad.jar", fabric_meta)
+    meta, error, icon_data = analyzer.read_metadata(jar)
+    assert error is None
+    assert meta["name"] == "bad"
+    assert meta["id"] in ("bad", None)
+    assert analyzer.classify(meta) == "服务端"
+    assert analyzer.curseforge_link(meta["name"]).endswith("/bad")
+    assert analyzer.mcmod_link(meta["name"]).endswith("key=bad")
+
+
+def test_modrinth_link_unhashable_meta():
+    meta = {"loader": "fabric", "id": ["a"], "name": "x"}
+    assert analyzer.get_loop().run_until_complete(analyzer.modrinth_link(meta, None)) is None
+
+
+def test_worker_crash_only_fails_its_own_jar(tmp_path, monkeypatch):
+    for i in range(12):
+        make_jar(tmp_path / f"m{i:02d}.jar", {"id": f"m{i}", "name": f"Mod {i}"})
+    make_jar(tmp_path / "crash.jar", {"id": "crash", "name": "Crash"})
+
+    async def no_modrinth(meta, session):
+        return None
+
+    # 多个 jar 同时在池中时崩溃，受牵连的 jar 也要能重试成功
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(analyzer, "read_metadata", importlib.import_module("crash_helper").read_metadata)
+    monkeypatch.setattr(analyzer, "modrinth_link", no_modrinth)
+    thread = analyzer.ModAnalyzerThread(tmp_path, gen_folder=False, gen_log=False)
+    try:
+        analyzer.get_loop().run_until_complete(thread.analyze_mods())
+    finally:
+        analyzer.shutdown_pool()
+        analyzer.close_session()
+
+    assert [m["name"] for m in thread.sections["解析失败"]] == ["crash.jar"]
+    assert thread.sections["解析失败"][0]["error"] == "解析进程崩溃"
+    assert len(thread.sections["服务端"]) == 12
+    assert thread.done_count == 13
+
+
+def stored_info(name, extra=b""):
+    info = zipfile.ZipInfo(name)
+    info.compress_type = zipfile.ZIP_STORED
+    info.extra = extra
+    return info
+
+
+class UnseekableWriter(io.RawIOBase):
+    """不可 seek 的输出流，zipfile 写入时会改用数据描述符（flag bit 3）"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def read_entries_both_ways(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return [(analyzer.read_entry(z, info), z.read(info)) for info in z.infolist()]
+
+
+def test_read_entry_stored_with_extra_field():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr(stored_info("fabric.mod.json", extra=b"\xfe\xca\x04\x00abcd"), b'{"id": "x"}')
+    for fast, slow in read_entries_both_ways(buf.getvalue()):
+        assert fast == slow == b'{"id": "x"}'
+
+
+def test_read_entry_data_descriptor():
+    out = UnseekableWriter()
+    with zipfile.ZipFile(out, "w") as z:
+        z.writestr(stored_info("fabric.mod.json"), b'{"id": "dd"}')
+    with zipfile.ZipFile(io.BytesIO(out.buffer.getvalue())) as z:
+        info = z.getinfo("fabric.mod.json")
+        assert info.flag_bits & 0x08
+        assert analyzer.read_entry(z, info) == z.read(info) == b'{"id": "dd"}'
+
+
+def test_read_entry_junk_prefix():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr(stored_info("a.txt"), b"first")
+        z.writestr(stored_info("fabric.mod.json"), b'{"id": "junk"}')
+    for fast, slow in read_entries_both_ways(b"#!junk prefix\n" * 10 + buf.getvalue()):
+        assert fast == slow
+
+
+def test_read_entry_falls_back_for_deflated_and_encrypted(monkeypatch):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("deflated.json", b"{}" * 100, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr(stored_info("stored.json"), b"{}")
+    with zipfile.ZipFile(buf) as z:
+        monkeypatch.setattr(z, "read", lambda info: b"fallback")
+        assert analyzer.read_entry(z, z.getinfo("deflated.json")) == b"fallback"
+        encrypted = z.getinfo("stored.json")
+        encrypted.flag_bits |= 0x1
+        assert analyzer.read_entry(z, encrypted) == b"fallback"
+
+
+def test_read_entry_falls_back_on_bad_magic(monkeypatch):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr(stored_info("fabric.mod.json"), b"{}")
+    data = bytearray(buf.getvalue())
+    data[0:4] = b"XXXX"
+    with zipfile.ZipFile(io.BytesIO(bytes(data))) as z:
+        monkeypatch.setattr(z, "read", lambda info: b"fallback")
+        assert analyzer.read_entry(z, z.getinfo("fabric.mod.json")) == b"fallback"
+
+
+def make_forge_jar(path, text, entry="META-INF/mods.toml"):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(entry, text)
+    return path
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('clientOnly=true\nmodLoader="javafml"\n[[mods]]\nmodId="a"\n', "仅客户端"),
+    ('modLoader="javafml"\n[[mods]]\nmodId="a"\nclientOnly="true"\n', "仅客户端"),
+    ('# clientOnly=true\nmodLoader="javafml"\n[[mods]]\nmodId="a"\n', "服务端"),
+])
+def test_forge_client_only(tmp_path, text, expected):
+    meta, error, _ = analyzer.read_metadata(make_forge_jar(tmp_path / "a.jar", text))
+    assert error is None
+    assert analyzer.classify(meta) == expected
+
+
+def test_forge_placeholders_are_ignored(tmp_path):
+    text = '[[mods]]\nmodId="${file.jarVersion}"\ndisplayName="${mod_name}"\n'
+    meta, error, _ = analyzer.read_metadata(make_forge_jar(tmp_path / "placeholder.jar", text))
+    assert error is None
+    assert meta["id"] is None
+    assert meta["name"] == "placeholder"
+
+
+def test_forge_invalid_toml_falls_back_to_line_scan(tmp_path):
+    text = '[[mods]\nmodId = "broken\n# clientOnly=true\nclientOnly = true\n'
+    meta, error, _ = analyzer.read_metadata(make_forge_jar(tmp_path / "broken.jar", text))
+    assert error is None
+    assert meta["client_only"] is True
+    assert meta["id"] is None
+    assert meta["name"] == "broken"
+
+
+def test_neoforge_mods_toml(tmp_path):
+    text = '[[mods]]\nmodId="neo"\ndisplayName="Neo Mod"\n'
+    jar = make_forge_jar(tmp_path / "neo.jar", text, entry="META-INF/neoforge.mods.toml")
+    meta, error, _ = analyzer.read_metadata(jar)
+    assert error is None
+    assert (meta["loader"], meta["id"], meta["name"]) == ("forge", "neo", "Neo Mod")
+    assert analyzer.classify(meta) == "服务端"